@@ -99,9 +99,8 @@ def get_learner_fn(
             env_state, timestep = jax.vmap(env.step, in_axes=(0, 0))(env_state, action)
 
             # LOG EPISODE METRICS
-            done = jax.tree_util.tree_map(
-                lambda x: jnp.repeat(x, config.system.num_agents).reshape(config.arch.num_envs, -1),
-                timestep.last(),
+            done = jnp.broadcast_to(
+                timestep.last()[:, jnp.newaxis], (config.arch.num_envs, config.system.num_agents)
             )
             info = timestep.extras["episode_metrics"]
 
@@ -153,11 +152,13 @@ def get_learner_fn(
         def _update_epoch(update_state: Tuple, _: Any) -> Tuple:
             """Update the network for a single epoch."""
 
-            def _update_minibatch(train_state: Tuple, batch_info: Tuple) -> Tuple:
+            def _update_minibatch(train_state: Tuple, batch_idxs: chex.Array) -> Tuple:
                 """Update the network for a single minibatch."""
-                # UNPACK TRAIN STATE AND BATCH INFO
+                # UNPACK TRAIN STATE AND GATHER THE MINIBATCH
                 params, opt_states = train_state
-                traj_batch, advantages, targets = batch_info
+                traj_batch, advantages, targets = jax.tree_util.tree_map(
+                    lambda x: jnp.take(x, batch_idxs, axis=0), batch
+                )
 
                 def _actor_loss_fn(
                     actor_params: FrozenDict,
@@ -280,17 +281,12 @@ def get_learner_fn(
             permutation = jax.random.permutation(shuffle_key, batch_size)
             batch = (traj_batch, advantages, targets)
             batch = jax.tree_util.tree_map(lambda x: merge_leading_dims(x, 2), batch)
-            shuffled_batch = jax.tree_util.tree_map(
-                lambda x: jnp.take(x, permutation, axis=0), batch
-            )
-            minibatches = jax.tree_util.tree_map(
-                lambda x: jnp.reshape(x, (config.system.num_minibatches, -1, *x.shape[1:])),
-                shuffled_batch,
-            )
+            # Each minibatch is gathered inside the scan, so no shuffled copy of the batch is made.
+            minibatch_idxs = permutation.reshape(config.system.num_minibatches, -1)
 
             # UPDATE MINIBATCHES
             (params, opt_states), loss_info = jax.lax.scan(
-                _update_minibatch, (params, opt_states), minibatches
+                _update_minibatch, (params, opt_states), minibatch_idxs
             )
 
             update_state = (params, opt_states, traj_batch, advantages, targets, key)
@@ -408,7 +404,7 @@ def learner_setup(
 
     # Get batched iterated update and replicate it to pmap it over cores.
     learn = get_learner_fn(env, apply_fns, update_fns, config)
-    learn = jax.pmap(learn, axis_name="device")
+    learn = jax.pmap(learn, axis_name="device", donate_argnums=0)
 
     # Broadcast params and optimiser state to cores and batch.
     broadcast = lambda x: jnp.broadcast_to(
@@ -565,6 +561,9 @@ def run_experiment(_config: DictConfig) -> None:
             metadata=OmegaConf.to_container(config, resolve=True),
         )
 
+    # Compile the learner ahead of time so the first logged steps per second excludes compilation.
+    learn = learn.lower(learner_state).compile()  # type: ignore
+
     # Run experiment for a total number of evaluations.
     max_episode_return = -jnp.inf
     best_params = None
@@ -612,7 +611,7 @@ def run_experiment(_config: DictConfig) -> None:
         # Prepare for evaluation.
         start_time = time.time()
 
-        trained_params = unreplicate_batch_dim(learner_state.params.actor_params)
+        trained_params = unreplicate_batch_dim(learner_output.learner_state.params.actor_params)
         key_e, *eval_keys = jax.random.split(key_e, n_devices + 1)
         eval_keys = jnp.stack(eval_keys)
         eval_keys = eval_keys.reshape(n_devices, -1)
@@ -20,6 +20,9 @@ import jax.numpy as jnp
 import tensorflow_probability.substrates.jax.bijectors as tfb
 import tensorflow_probability.substrates.jax.distributions as tfd
 
+# Value given to masked out logits/q-values. Computed once at import instead of on every call.
+MASKED_VALUE = jnp.finfo(jnp.float32).min
+
 
 class TanhTransformedDistribution(tfd.TransformedDistribution):
     """A distribution transformed using the `tanh` function.
@@ -118,11 +121,7 @@ class MaskedEpsGreedyDistribution(tfd.Categorical):
 
         # GREEDY PART (1-eps %)
         # set masked actions to value not chosen by argmax
-        masked_q_vals = jnp.where(
-            mask,
-            q_values,
-            jnp.finfo(jnp.float32).min,
-        )
+        masked_q_vals = jnp.where(mask, q_values, MASKED_VALUE)
 
         # greedy argmax over action-value dim
         greedy_actions = jnp.argmax(masked_q_vals, axis=-1)
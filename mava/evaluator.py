@@ -196,8 +196,8 @@ def make_rec_eval_act_fn(actor_apply_fn: RecActorApply, config: DictConfig) -> E
     ) -> Tuple[Action, Dict]:
         hidden_state = actor_state[_hidden_state]
 
-        n_agents = timestep.observation.agents_view.shape[1]
-        last_done = timestep.last()[:, jnp.newaxis].repeat(n_agents, axis=-1)
+        batch_size, n_agents = timestep.observation.agents_view.shape[:2]
+        last_done = jnp.broadcast_to(timestep.last()[:, jnp.newaxis], (batch_size, n_agents))
         ac_in = (timestep.observation, last_done)
         ac_in = jax.tree_map(lambda x: x[jnp.newaxis], ac_in)  # add batch dim to obs
 
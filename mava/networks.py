@@ -24,6 +24,7 @@ from flax import linen as nn
 from flax.linen.initializers import orthogonal
 
 from mava.distributions import (
+    MASKED_VALUE,
     IdentityTransformation,
     MaskedEpsGreedyDistribution,
     TanhTransformedDistribution,
@@ -42,6 +43,9 @@ class MLPTorso(nn.Module):
     layer_sizes: Sequence[int]
     activation: str = "relu"
     use_layer_norm: bool = False
+    # Dtype the layers compute in, e.g. bfloat16 for mixed precision. Params are always kept in
+    # float32 and the output is cast back to float32 so heads and losses are unaffected.
+    dtype: str = "float32"
 
     def setup(self) -> None:
         self.activation_fn = _parse_activation_fn(self.activation)
@@ -49,13 +53,14 @@ class MLPTorso(nn.Module):
     @nn.compact
     def __call__(self, observation: chex.Array) -> chex.Array:
         """Forward pass."""
+        dtype = jnp.dtype(self.dtype)
         x = observation
         for layer_size in self.layer_sizes:
-            x = nn.Dense(layer_size, kernel_init=orthogonal(np.sqrt(2)))(x)
+            x = nn.Dense(layer_size, kernel_init=orthogonal(np.sqrt(2)), dtype=dtype)(x)
             if self.use_layer_norm:
-                x = nn.LayerNorm(use_scale=False)(x)
+                x = nn.LayerNorm(use_scale=False, dtype=dtype)(x)
             x = self.activation_fn(x)
-        return x
+        return x.astype(jnp.float32)
 
 
 class CNNTorso(nn.Module):
@@ -113,11 +118,7 @@ class DiscreteActionHead(nn.Module):
         """
         actor_logits = nn.Dense(self.action_dim, kernel_init=orthogonal(0.01))(obs_embedding)
 
-        masked_logits = jnp.where(
-            observation.action_mask,
-            actor_logits,
-            jnp.finfo(jnp.float32).min,
-        )
+        masked_logits = jnp.where(observation.action_mask, actor_logits, MASKED_VALUE)
 
         #  We transform this distribution with the `Identity()` transformation to
         # keep the API identical to the ContinuousActionHead.
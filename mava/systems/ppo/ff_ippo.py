@@ -17,7 +17,6 @@ import time
 from typing import Any, Dict, Tuple
 
 import chex
-import flax
 import hydra
 import jax
 import jax.numpy as jnp
@@ -93,9 +92,8 @@ def get_learner_fn(
             env_state, timestep = jax.vmap(env.step, in_axes=(0, 0))(env_state, action)
 
             # LOG EPISODE METRICS
-            done = jax.tree_util.tree_map(
-                lambda x: jnp.repeat(x, config.system.num_agents).reshape(config.arch.num_envs, -1),
-                timestep.last(),
+            done = jnp.broadcast_to(
+                timestep.last()[:, jnp.newaxis], (config.arch.num_envs, config.system.num_agents)
             )
             info = timestep.extras["episode_metrics"]
 
@@ -149,14 +147,20 @@ def get_learner_fn(
 
         advantages, targets = _calculate_gae(traj_batch, last_val)
 
+        # The episode metrics are only logged, so keep them out of the update epochs.
+        metric = traj_batch.info
+        traj_batch = traj_batch._replace(info={})
+
         def _update_epoch(update_state: Tuple, _: Any) -> Tuple:
             """Update the network for a single epoch."""
 
-            def _update_minibatch(train_state: Tuple, batch_info: Tuple) -> Tuple:
+            def _update_minibatch(train_state: Tuple, batch_idxs: chex.Array) -> Tuple:
                 """Update the network for a single minibatch."""
-                # UNPACK TRAIN STATE AND BATCH INFO
+                # UNPACK TRAIN STATE AND GATHER THE MINIBATCH
                 params, opt_states, key = train_state
-                traj_batch, advantages, targets = batch_info
+                traj_batch, advantages, targets = jax.tree_util.tree_map(
+                    lambda x: jnp.take(x, batch_idxs, axis=0), batch
+                )
 
                 def _actor_loss_fn(
                     actor_params: FrozenDict,
@@ -288,17 +292,12 @@ def get_learner_fn(
             permutation = jax.random.permutation(shuffle_key, batch_size)
             batch = (traj_batch, advantages, targets)
             batch = jax.tree_util.tree_map(lambda x: merge_leading_dims(x, 2), batch)
-            shuffled_batch = jax.tree_util.tree_map(
-                lambda x: jnp.take(x, permutation, axis=0), batch
-            )
-            minibatches = jax.tree_util.tree_map(
-                lambda x: jnp.reshape(x, (config.system.num_minibatches, -1, *x.shape[1:])),
-                shuffled_batch,
-            )
+            # Each minibatch is gathered inside the scan, so no shuffled copy of the batch is made.
+            minibatch_idxs = permutation.reshape(config.system.num_minibatches, -1)
 
             # UPDATE MINIBATCHES
             (params, opt_states, entropy_key), loss_info = jax.lax.scan(
-                _update_minibatch, (params, opt_states, entropy_key), minibatches
+                _update_minibatch, (params, opt_states, entropy_key), minibatch_idxs
             )
 
             update_state = (params, opt_states, traj_batch, advantages, targets, key)
@@ -313,7 +312,6 @@ def get_learner_fn(
 
         params, opt_states, traj_batch, advantages, targets, key = update_state
         learner_state = LearnerState(params, opt_states, key, env_state, last_timestep)
-        metric = traj_batch.info
         return learner_state, (metric, loss_info)
 
     def learner_fn(learner_state: LearnerState) -> ExperimentOutput[LearnerState]:
@@ -403,7 +401,7 @@ def learner_setup(
 
     # Get batched iterated update and replicate it to pmap it over cores.
     learn = get_learner_fn(env, apply_fns, update_fns, config)
-    learn = jax.pmap(learn, axis_name="device")
+    learn = jax.pmap(learn, axis_name="device", donate_argnums=0)
 
     # Initialise environment states and timesteps: across devices and batches.
     key, *env_keys = jax.random.split(
@@ -440,7 +438,7 @@ def learner_setup(
     replicate_learner = jax.tree_map(broadcast, replicate_learner)
 
     # Duplicate learner across devices.
-    replicate_learner = flax.jax_utils.replicate(replicate_learner, devices=jax.devices())
+    replicate_learner = jax.device_put_replicated(replicate_learner, jax.devices())
 
     # Initialise learner state.
     params, opt_states, step_keys = replicate_learner
@@ -505,6 +503,9 @@ def run_experiment(_config: DictConfig) -> float:
             **config.logger.checkpointing.save_args,  # Checkpoint args
         )
 
+    # Compile the learner ahead of time so the first logged steps per second excludes compilation.
+    learn = learn.lower(learner_state).compile()  # type: ignore
+
     # Run experiment for a total number of evaluations.
     max_episode_return = -jnp.inf
     best_params = None
@@ -528,7 +529,7 @@ def run_experiment(_config: DictConfig) -> float:
         logger.log(learner_output.train_metrics, t, eval_step, LogEvent.TRAIN)
 
         # Prepare for evaluation.
-        trained_params = unreplicate_batch_dim(learner_state.params.actor_params)
+        trained_params = unreplicate_batch_dim(learner_output.learner_state.params.actor_params)
         key_e, *eval_keys = jax.random.split(key_e, n_devices + 1)
         eval_keys = jnp.stack(eval_keys)
         eval_keys = eval_keys.reshape(n_devices, -1)
@@ -17,7 +17,6 @@ import time
 from typing import Any, Dict, Tuple
 
 import chex
-import flax
 import hydra
 import jax
 import jax.numpy as jnp
@@ -127,9 +126,8 @@ def get_learner_fn(
             env_state, timestep = jax.vmap(env.step, in_axes=(0, 0))(env_state, action)
 
             # log episode return and length
-            done = jax.tree_util.tree_map(
-                lambda x: jnp.repeat(x, config.system.num_agents).reshape(config.arch.num_envs, -1),
-                timestep.last(),
+            done = jnp.broadcast_to(
+                timestep.last()[:, jnp.newaxis], (config.arch.num_envs, config.system.num_agents)
             )
             info = timestep.extras["episode_metrics"]
 
@@ -201,14 +199,20 @@ def get_learner_fn(
 
         advantages, targets = _calculate_gae(traj_batch, last_val, last_done)
 
+        # The episode metrics are only logged, so keep them out of the update epochs.
+        metric = traj_batch.info
+        traj_batch = traj_batch._replace(info={})
+
         def _update_epoch(update_state: Tuple, _: Any) -> Tuple:
             """Update the network for a single epoch."""
 
-            def _update_minibatch(train_state: Tuple, batch_info: Tuple) -> Tuple:
+            def _update_minibatch(train_state: Tuple, batch_idxs: chex.Array) -> Tuple:
                 """Update the network for a single minibatch."""
-                # UNPACK TRAIN STATE AND BATCH INFO
+                # UNPACK TRAIN STATE AND GATHER THE MINIBATCH
                 params, opt_states, key = train_state
-                traj_batch, advantages, targets = batch_info
+                traj_batch, advantages, targets = jax.tree_util.tree_map(
+                    lambda x: jnp.take(x, batch_idxs, axis=1), batch
+                )
 
                 def _actor_loss_fn(
                     actor_params: FrozenDict,
@@ -353,20 +357,12 @@ def get_learner_fn(
             permutation = jax.random.permutation(
                 shuffle_key, config.arch.num_envs * num_recurrent_chunks
             )
-            shuffled_batch = jax.tree_util.tree_map(
-                lambda x: jnp.take(x, permutation, axis=1), batch
-            )
-            reshaped_batch = jax.tree_util.tree_map(
-                lambda x: jnp.reshape(
-                    x, (x.shape[0], config.system.num_minibatches, -1, *x.shape[2:])
-                ),
-                shuffled_batch,
-            )
-            minibatches = jax.tree_util.tree_map(lambda x: jnp.swapaxes(x, 1, 0), reshaped_batch)
+            # Each minibatch is gathered inside the scan, so no shuffled copy of the batch is made.
+            minibatch_idxs = permutation.reshape(config.system.num_minibatches, -1)
 
             # UPDATE MINIBATCHES
             (params, opt_states, entropy_key), loss_info = jax.lax.scan(
-                _update_minibatch, (params, opt_states, entropy_key), minibatches
+                _update_minibatch, (params, opt_states, entropy_key), minibatch_idxs
             )
 
             update_state = (
@@ -403,7 +399,6 @@ def get_learner_fn(
             last_done,
             hstates,
         )
-        metric = traj_batch.info
         return learner_state, (metric, loss_info)
 
     def learner_fn(learner_state: RNNLearnerState) -> ExperimentOutput[RNNLearnerState]:
@@ -517,7 +512,7 @@ def learner_setup(
 
     # Get batched iterated update and replicate it to pmap it over cores.
     learn = get_learner_fn(env, apply_fns, update_fns, config)
-    learn = jax.pmap(learn, axis_name="device")
+    learn = jax.pmap(learn, axis_name="device", donate_argnums=0)
 
     # Pack params and initial states.
     params = Params(actor_params, critic_params)
@@ -565,7 +560,7 @@ def learner_setup(
     replicate_learner = jax.tree_map(broadcast, replicate_learner)
 
     # Duplicate learner across devices.
-    replicate_learner = flax.jax_utils.replicate(replicate_learner, devices=jax.devices())
+    replicate_learner = jax.device_put_replicated(replicate_learner, jax.devices())
 
     # Initialise learner state.
     params, opt_states, hstates, step_keys, dones = replicate_learner
@@ -650,6 +645,10 @@ def run_experiment(_config: DictConfig) -> float:
         (n_devices, eval_batch_size, config.system.num_agents),
         config.network.hidden_state_dim,
     )
+
+    # Compile the learner ahead of time so the first logged steps per second excludes compilation.
+    learn = learn.lower(learner_state).compile()  # type: ignore
+
     # Run experiment for a total number of evaluations.
     max_episode_return = -jnp.inf
     best_params = None
@@ -672,7 +671,7 @@ def run_experiment(_config: DictConfig) -> float:
         logger.log(learner_output.train_metrics, t, eval_step, LogEvent.TRAIN)
 
         # Prepare for evaluation.
-        trained_params = unreplicate_batch_dim(learner_state.params.actor_params)
+        trained_params = unreplicate_batch_dim(learner_output.learner_state.params.actor_params)
         key_e, *eval_keys = jax.random.split(key_e, n_devices + 1)
         eval_keys = jnp.stack(eval_keys)
         eval_keys = eval_keys.reshape(n_devices, -1)
@@ -34,6 +34,7 @@ from jumanji.types import TimeStep
 from omegaconf import DictConfig, OmegaConf
 from rich.pretty import pprint
 
+from mava.distributions import MASKED_VALUE
 from mava.evaluator import ActorState, get_eval_fn, get_num_eval_envs
 from mava.networks import RecQNetwork, ScannedRNN
 from mava.systems.q_learning.types import (
@@ -397,17 +398,19 @@ def make_update_fns(
             next_obs, next_term_or_trunc
         )
 
-        # eps defaults to 0
-        _, next_online_greedy_dist = q_net.apply(
-            params.online, hidden_state, next_obs_term_or_trunc
+        _, next_q_vals_online = q_net.apply(
+            params.online, hidden_state, next_obs_term_or_trunc, method="get_q_values"
         )
 
         _, next_q_vals_target = q_net.apply(
             params.target, hidden_state, next_obs_term_or_trunc, method="get_q_values"
         )
 
-        # Get the greedy action
-        next_action = next_online_greedy_dist.mode()  # (T, B, ...)
+        # Get the greedy action directly from the masked q values, this is the mode of the
+        # eps-greedy distribution with eps=0 without building its one-hot probabilities.
+        next_obs_rnn, _ = next_obs_term_or_trunc
+        next_q_vals_online = jnp.where(next_obs_rnn.action_mask, next_q_vals_online, MASKED_VALUE)
+        next_action = jnp.argmax(next_q_vals_online, axis=-1)  # (T, B, ...)
 
         # Double q-value selection
         next_q_val = jnp.squeeze(
@@ -588,6 +591,9 @@ def run_experiment(cfg: DictConfig) -> float:
 
     max_episode_return = -jnp.inf
 
+    # Compile the update ahead of time so the first logged steps per second excludes compilation.
+    update = update.lower(learner_state).compile()  # type: ignore
+
     # Main loop:
     for eval_idx, t in enumerate(
         range(steps_per_rollout, int(cfg.system.total_timesteps + 1), steps_per_rollout)
@@ -41,7 +41,6 @@ from mava.systems.sac.types import (
     Networks,
     Optimisers,
     OptStates,
-    QVals,
     QValsAndTarget,
     SacParams,
     Transition,
@@ -49,7 +48,11 @@ from mava.systems.sac.types import (
 from mava.types import MarlEnv, Observation
 from mava.utils import make_env as environments
 from mava.utils.checkpointing import Checkpointer
-from mava.utils.jax_utils import unreplicate_batch_dim, unreplicate_n_dims
+from mava.utils.jax_utils import (
+    merge_leading_dims,
+    unreplicate_batch_dim,
+    unreplicate_n_dims,
+)
 from mava.utils.logger import LogEvent, MavaLogger
 from mava.utils.total_timestep_checker import check_total_timesteps
 from mava.wrappers import episode_metrics
@@ -101,7 +104,7 @@ def init(
     n_agents = env.num_agents
     action_dim = env.action_dim
 
-    key, actor_key, q1_key, q2_key, q1_target_key, q2_target_key = jax.random.split(key, 6)
+    key, actor_key, q_key, q_target_key = jax.random.split(key, 4)
 
     acts = env.action_spec().generate_value()  # all agents actions
     act_single_batched = acts[0][jnp.newaxis, ...]  # batch single agent action
@@ -119,10 +122,11 @@ def init(
     # Making Q networks
     critic_torso = hydra.utils.instantiate(cfg.network.critic_network.pre_torso)
     q_network = QNetwork(critic_torso)
-    q1_params = q_network.init(q1_key, obs_single_batched, act_single_batched)
-    q2_params = q_network.init(q2_key, obs_single_batched, act_single_batched)
-    q1_target_params = q_network.init(q1_target_key, obs_single_batched, act_single_batched)
-    q2_target_params = q_network.init(q2_target_key, obs_single_batched, act_single_batched)
+    # Both Q networks' params are stacked on a leading axis so they can be applied with one vmap.
+    init_q_networks = jax.vmap(q_network.init, in_axes=(0, None, None))
+    q_keys, q_target_keys = jax.random.split(q_key, 2), jax.random.split(q_target_key, 2)
+    online_q_params = init_q_networks(q_keys, obs_single_batched, act_single_batched)
+    target_q_params = init_q_networks(q_target_keys, obs_single_batched, act_single_batched)
 
     # Automatic entropy tuning
     target_entropy = -cfg.system.target_entropy_scale * action_dim
@@ -136,8 +140,6 @@ def init(
         log_alpha = jnp.broadcast_to(log_alpha, target_entropy.shape)
 
     # Pack params
-    online_q_params = QVals(q1_params, q2_params)
-    target_q_params = QVals(q1_target_params, q2_target_params)
     params = SacParams(actor_params, QValsAndTarget(online_q_params, target_q_params), log_alpha)
 
     # Make opt states.
@@ -238,12 +240,15 @@ def make_update_fns(
     actor_net, q_net = networks
     actor_opt, q_opt, alpha_opt = optims
 
+    # Applies both stacked Q networks at once, returning Q values of shape (2, B, A).
+    q_apply = jax.vmap(q_net.apply, in_axes=(0, None, None))
+
     full_action_shape = (cfg.arch.num_envs, *env.action_spec().shape)
 
     def step(
-        action: Array, obs: Observation, env_state: State, buffer_state: BufferState
-    ) -> Tuple[Array, State, BufferState, Dict]:
-        """Given an action, step the environment and add to the buffer."""
+        action: Array, obs: Observation, env_state: State
+    ) -> Tuple[Array, State, Transition, Dict]:
+        """Given an action, step the environment and return the transition."""
         env_state, timestep = jax.vmap(env.step)(env_state, action)
         next_obs = timestep.observation
         rewards = timestep.reward
@@ -253,28 +258,29 @@ def make_update_fns(
         real_next_obs = infos["real_next_obs"]
 
         transition = Transition(obs, action, rewards, terms, real_next_obs)
-        buffer_state = rb.add(buffer_state, transition)
 
-        return next_obs, env_state, buffer_state, infos["episode_metrics"]
+        return next_obs, env_state, transition, infos["episode_metrics"]
+
+    def add_to_buffer(buffer_state: BufferState, transitions: Transition) -> BufferState:
+        """Add a whole rollout to the buffer in one call: (T, E, ...) -> (T * E, ...)."""
+        transitions = jax.tree_map(lambda x: merge_leading_dims(x, 2), transitions)
+        return rb.add(buffer_state, transitions)
 
     # losses:
     def q_loss_fn(
-        q_params: QVals, obs: Array, action: Array, target: Array
+        q_params: FrozenVariableDict, obs: Array, action: Array, target: Array
     ) -> Tuple[Array, Metrics]:
-        q1_params, q2_params = q_params
-        q1_a_values = q_net.apply(q1_params, obs, action)
-        q2_a_values = q_net.apply(q2_params, obs, action)
-
-        q1_loss = jnp.mean(jnp.square(q1_a_values - target))
-        q2_loss = jnp.mean(jnp.square(q2_a_values - target))
+        q_a_values = q_apply(q_params, obs, action)
+        # Mean over the batch and agent dims, keeping a separate loss per Q network.
+        q1_loss, q2_loss = jnp.mean(jnp.square(q_a_values - target), axis=(1, 2))
 
         loss = q1_loss + q2_loss
         loss_info = {
             "loss": loss,
             "q1_loss": q1_loss,
             "q2_loss": q2_loss,
-            "q1_a_vals": q1_a_values,
-            "q2_a_vals": q2_a_values,
+            "q1_a_vals": q_a_values[0],
+            "q2_a_vals": q_a_values[1],
         }
 
         return loss, loss_info
@@ -283,18 +289,17 @@ def make_update_fns(
         actor_params: FrozenVariableDict,
         obs: Observation,
         alpha: Array,
-        q_params: QVals,
+        q_params: FrozenVariableDict,
         key: chex.PRNGKey,
-    ) -> Array:
+    ) -> Tuple[Array, Array]:
         pi = actor_net.apply(actor_params, obs)
         action = pi.sample(seed=key)
         log_prob = pi.log_prob(action)
 
-        qval_1 = q_net.apply(q_params.q1, obs, action)
-        qval_2 = q_net.apply(q_params.q2, obs, action)
-        min_q_val = jnp.minimum(qval_1, qval_2)
+        min_q_val = jnp.min(q_apply(q_params, obs, action), axis=0)
 
-        return ((alpha * log_prob) - min_q_val).mean()
+        # Return the log prob so it can be reused by the alpha loss without another forward pass.
+        return ((alpha * log_prob) - min_q_val).mean(), log_prob
 
     def alpha_loss_fn(log_alpha: Array, log_pi: Array, target_entropy: Array) -> Array:
         return jnp.mean(-jnp.exp(log_alpha) * (log_pi + target_entropy))
@@ -309,9 +314,7 @@ def make_update_fns(
         next_action = pi.sample(seed=key)
         next_log_prob = pi.log_prob(next_action)
 
-        next_q1_val = q_net.apply(params.q.targets.q1, data.next_obs, next_action)
-        next_q2_val = q_net.apply(params.q.targets.q2, data.next_obs, next_action)
-        next_q_val = jnp.minimum(next_q1_val, next_q2_val)
+        next_q_val = jnp.min(q_apply(params.q.targets, data.next_obs, next_action), axis=0)
         next_q_val = next_q_val - jnp.exp(params.log_alpha) * next_log_prob
 
         target_q_val = data.reward + (1.0 - data.done) * cfg.system.gamma * next_q_val
@@ -344,16 +347,31 @@ def make_update_fns(
         # compensate for the delay by doing `policy_frequency` updates instead of 1.
         assert cfg.system.policy_update_delay > 0, "Need to have a policy update delay > 0."
         for _ in range(cfg.system.policy_update_delay):
-            actor_key, alpha_key = jax.random.split(key)
+            # A fresh key per iteration, so each delayed update samples different actions.
+            key, actor_key = jax.random.split(key)
 
-            # Update actor.
-            actor_grad_fn = jax.value_and_grad(actor_loss_fn)
-            actor_loss, act_grads = actor_grad_fn(
+            # Actor and alpha grads are both taken at the current params.
+            actor_grad_fn = jax.value_and_grad(actor_loss_fn, has_aux=True)
+            (actor_loss, log_prob), act_grads = actor_grad_fn(
                 params.actor, data.obs, jnp.exp(params.log_alpha), params.q.online, actor_key
             )
-            # Mean over the device and batch dimensions.
-            actor_loss, act_grads = lax.pmean((actor_loss, act_grads), axis_name="device")
-            actor_loss, act_grads = lax.pmean((actor_loss, act_grads), axis_name="batch")
+
+            # Get alpha grads if autotuning, loss and grads are 0 if autotune is off.
+            alpha_loss, alpha_grads = 0.0, jnp.zeros_like(params.log_alpha)
+            if cfg.system.autotune:
+                # Reuse the log probs from the actor loss (not differentiated here). They come
+                # from the policy before this iteration's actor update, so alpha is tuned against
+                # the pre-update policy rather than re-evaluating the updated one.
+                alpha_grad_fn = jax.value_and_grad(alpha_loss_fn)
+                alpha_loss, alpha_grads = alpha_grad_fn(params.log_alpha, log_prob, target_entropy)
+
+            # Mean over the device and batch dimensions, actor and alpha in a single reduction.
+            losses_and_grads = (actor_loss, act_grads, alpha_loss, alpha_grads)
+            losses_and_grads = lax.pmean(losses_and_grads, axis_name="device")
+            losses_and_grads = lax.pmean(losses_and_grads, axis_name="batch")
+            actor_loss, act_grads, alpha_loss, alpha_grads = losses_and_grads
+
+            # Update actor.
             actor_updates, new_actor_opt_state = actor_opt.update(act_grads, opt_states.actor)
             new_actor_params = optax.apply_updates(params.actor, actor_updates)
 
@@ -361,17 +379,7 @@ def make_update_fns(
             opt_states = opt_states._replace(actor=new_actor_opt_state)
 
             # Update alpha if autotuning
-            alpha_loss = 0.0  # loss is 0 if autotune is off
             if cfg.system.autotune:
-                # Get log prob for alpha loss
-                pi = actor_net.apply(params.actor, data.obs)
-                action = pi.sample(seed=key)
-                log_prob = pi.log_prob(action)
-
-                alpha_grad_fn = jax.value_and_grad(alpha_loss_fn)
-                alpha_loss, alpha_grads = alpha_grad_fn(params.log_alpha, log_prob, target_entropy)
-                alpha_loss, alpha_grads = lax.pmean((alpha_loss, alpha_grads), axis_name="device")
-                alpha_loss, alpha_grads = lax.pmean((alpha_loss, alpha_grads), axis_name="batch")
                 alpha_updates, new_alpha_opt_state = alpha_opt.update(alpha_grads, opt_states.alpha)
                 new_log_alpha = optax.apply_updates(params.log_alpha, alpha_updates)
 
@@ -414,31 +422,29 @@ def make_update_fns(
         return (buffer_state, params, opt_states, t, key), losses
 
     def act(
-        carry: Tuple[FrozenVariableDict, Array, State, BufferState, chex.PRNGKey], _: Any
-    ) -> Tuple[Tuple[FrozenVariableDict, Array, State, BufferState, chex.PRNGKey], Dict]:
-        """Acting loop: select action, step env, add to buffer."""
-        actor_params, obs, env_state, buffer_state, key = carry
+        carry: Tuple[FrozenVariableDict, Array, State, chex.PRNGKey], _: Any
+    ) -> Tuple[Tuple[FrozenVariableDict, Array, State, chex.PRNGKey], Tuple[Transition, Dict]]:
+        """Acting loop: select action, step env, return the transition."""
+        actor_params, obs, env_state, key = carry
 
         pi = actor_net.apply(actor_params, obs)
         action = pi.sample(seed=key)
 
-        next_obs, env_state, buffer_state, metrics = step(action, obs, env_state, buffer_state)
-        return (actor_params, next_obs, env_state, buffer_state, key), metrics
+        next_obs, env_state, transition, metrics = step(action, obs, env_state)
+        return (actor_params, next_obs, env_state, key), (transition, metrics)
 
-    def explore(carry: LearnerState, _: Any) -> Tuple[LearnerState, Metrics]:
+    def explore(carry: LearnerState, _: Any) -> Tuple[LearnerState, Tuple[Transition, Metrics]]:
         """Take random actions to fill up buffer at the start of training."""
-        obs, env_state, buffer_state, _, _, t, key = carry
+        obs, env_state, _, _, _, t, key = carry
         assert isinstance(obs, Observation)  # mypy thinks it's Observation | ObservationGlobalState
 
         key, explore_key = jax.random.split(key)
         action = jax.random.uniform(explore_key, full_action_shape)
-        next_obs, env_state, buffer_state, metrics = step(action, obs, env_state, buffer_state)
+        next_obs, env_state, transition, metrics = step(action, obs, env_state)
 
         t += cfg.arch.num_envs
-        learner_state = carry._replace(
-            obs=next_obs, env_state=env_state, buffer_state=buffer_state, t=t, key=key
-        )
-        return learner_state, metrics
+        learner_state = carry._replace(obs=next_obs, env_state=env_state, t=t, key=key)
+        return learner_state, (transition, metrics)
 
     scanned_train = lambda state: lax.scan(train, state, None, length=cfg.system.epochs)
     scanned_act = lambda state: lax.scan(act, state, None, length=cfg.system.rollout_length)
@@ -449,8 +455,9 @@ def make_update_fns(
         obs, env_state, buffer_state, params, opt_states, t, key = carry
         key, act_key, learn_key = jax.random.split(key, 3)
         # Act
-        act_state = (params.actor, obs, env_state, buffer_state, act_key)
-        (_, next_obs, env_state, buffer_state, _), metrics = scanned_act(act_state)
+        act_state = (params.actor, obs, env_state, act_key)
+        (_, next_obs, env_state, _), (transitions, metrics) = scanned_act(act_state)
+        buffer_state = add_to_buffer(buffer_state, transitions)
 
         # Sample and learn
         learn_state = (buffer_state, params, opt_states, t, learn_key)
@@ -465,11 +472,15 @@ def make_update_fns(
     # pmap and scan over explore and update_step
     # Make sure to not do num_envs explore steps (could fill up the buffer too much).
     explore_steps = cfg.system.explore_steps // cfg.arch.num_envs
+
+    def scanned_explore(state: LearnerState) -> Tuple[LearnerState, Metrics]:
+        """Explore for `explore_steps` and add all transitions to the buffer at once."""
+        state, (transitions, metrics) = lax.scan(explore, state, None, length=explore_steps)
+        buffer_state = add_to_buffer(state.buffer_state, transitions)
+        return state._replace(buffer_state=buffer_state), metrics
+
     pmaped_explore = jax.pmap(
-        jax.vmap(
-            lambda state: lax.scan(explore, state, None, length=explore_steps),
-            axis_name="batch",
-        ),
+        jax.vmap(scanned_explore, axis_name="batch"),
         axis_name="device",
         donate_argnums=0,
     )
@@ -533,6 +544,9 @@ def run_experiment(cfg: DictConfig) -> float:
     final_metrics["steps_per_second"] = sps
     logger.log(final_metrics, cfg.system.explore_steps, 0, LogEvent.ACT)
 
+    # Compile the update ahead of time so the first logged steps per second excludes compilation.
+    update = update.lower(learner_state).compile()  # type: ignore
+
     # Main loop:
     # We want start to align with the final step of the first pmaped_learn,
     # where we've done explore_steps and 1 full learn step.
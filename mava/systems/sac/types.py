@@ -30,14 +30,10 @@ Optimisers: TypeAlias = Tuple[
 ]
 
 
-class QVals(NamedTuple):
-    q1: FrozenVariableDict
-    q2: FrozenVariableDict
-
-
 class QValsAndTarget(NamedTuple):
-    online: QVals
-    targets: QVals
+    # Params of both Q networks stacked on a leading axis of size 2.
+    online: FrozenVariableDict
+    targets: FrozenVariableDict
 
 
 class SacParams(NamedTuple):
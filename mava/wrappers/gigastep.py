@@ -153,7 +153,7 @@ class GigastepWrapper(Wrapper):
         obs_data = {
             "agents_view": obs,
             "action_mask": self.action_mask(),
-            "step_count": jnp.repeat(state.step, self.num_agents),
+            "step_count": jnp.broadcast_to(state.step, (self.num_agents,)),
         }
 
         if self.has_global_state:
@@ -181,7 +181,7 @@ class GigastepWrapper(Wrapper):
         """
         # the global observation needs to be tested once we have better heuristics for adversaries.
         global_obs = jnp.concatenate(obs, axis=0)
-        return jnp.tile(global_obs, (self.num_agents, 1))
+        return jnp.broadcast_to(global_obs, (self.num_agents, *global_obs.shape))
 
     def observation_spec(self) -> specs.Spec:
         agents_view = specs.BoundedArray(
@@ -221,7 +221,7 @@ class JaxMarlWrapper(Wrapper, ABC):
         )
 
         obs = self._create_observation(obs, env_state)
-        obs = obs._replace(step_count=jnp.repeat(state.step, self.num_agents))
+        obs = obs._replace(step_count=jnp.broadcast_to(state.step, (self.num_agents,)))
         step_type = jax.lax.select(done["__all__"], StepType.LAST, StepType.MID)
 
         ts = TimeStep(
@@ -370,7 +370,8 @@ class SmaxWrapper(JaxMarlWrapper):
 
     def get_global_state(self, wrapped_env_state: Any, obs: Dict[str, Array]) -> Array:
         """Get global state from observation and copy it for each agent."""
-        return jnp.tile(jnp.array(obs["world_state"]), (self.num_agents, 1))
+        world_state = jnp.asarray(obs["world_state"])
+        return jnp.broadcast_to(world_state, (self.num_agents, *world_state.shape))
 
 
 class MabraxWrapper(JaxMarlWrapper):
@@ -402,4 +403,6 @@ class MabraxWrapper(JaxMarlWrapper):
     def get_global_state(self, wrapped_env_state: BraxState, obs: Dict[str, Array]) -> Array:
         """Get global state from observation and copy it for each agent."""
         # Use the global state of brax.
-        return jnp.tile(wrapped_env_state.obs, (self.num_agents, 1))
+        return jnp.broadcast_to(
+            wrapped_env_state.obs, (self.num_agents, *wrapped_env_state.obs.shape)
+        )
@@ -55,7 +55,7 @@ class JumanjiMarlWrapper(Wrapper, ABC):
         available global state - concatenate all observations.
         """
         global_state = jnp.concatenate(obs.agents_view, axis=0)
-        global_state = jnp.tile(global_state, (self._env.num_agents, 1))
+        global_state = jnp.broadcast_to(global_state, (self._env.num_agents, *global_state.shape))
         return global_state
 
     def reset(self, key: chex.PRNGKey) -> Tuple[State, TimeStep]:
@@ -92,13 +92,7 @@ class JumanjiMarlWrapper(Wrapper, ABC):
 
     def observation_spec(self) -> specs.Spec[Union[Observation, ObservationGlobalState]]:
         """Specification of the observation of the environment."""
-        step_count = specs.BoundedArray(
-            (self.num_agents,),
-            int,
-            jnp.zeros(self.num_agents, dtype=int),
-            jnp.repeat(self.time_limit, self.num_agents),
-            "step_count",
-        )
+        step_count = specs.BoundedArray((self.num_agents,), int, 0, self.time_limit, "step_count")
 
         obs_spec = self._env.observation_spec()
         obs_data = {
@@ -137,10 +131,10 @@ class RwareWrapper(JumanjiMarlWrapper):
         observation = Observation(
             agents_view=timestep.observation.agents_view,
             action_mask=timestep.observation.action_mask,
-            step_count=jnp.repeat(timestep.observation.step_count, self.num_agents),
+            step_count=jnp.broadcast_to(timestep.observation.step_count, (self.num_agents,)),
         )
-        reward = jnp.repeat(timestep.reward, self.num_agents)
-        discount = jnp.repeat(timestep.discount, self.num_agents)
+        reward = jnp.broadcast_to(timestep.reward, (self.num_agents,))
+        discount = jnp.broadcast_to(timestep.discount, (self.num_agents,))
         return timestep.replace(observation=observation, reward=reward, discount=discount)
 
 
@@ -171,8 +165,8 @@ class LbfWrapper(JumanjiMarlWrapper):
         """Aggregate individual rewards across agents."""
         team_reward = jnp.sum(timestep.reward)
 
-        # Repeat the aggregated reward for each agent.
-        reward = jnp.repeat(team_reward, self.num_agents)
+        # Broadcast the aggregated reward to each agent.
+        reward = jnp.broadcast_to(team_reward, (self.num_agents,))
         return timestep.replace(observation=observation, reward=reward)
 
     def modify_timestep(self, timestep: TimeStep) -> TimeStep[Observation]:
@@ -183,7 +177,7 @@ class LbfWrapper(JumanjiMarlWrapper):
         modified_observation = Observation(
             agents_view=timestep.observation.agents_view,
             action_mask=timestep.observation.action_mask,
-            step_count=jnp.repeat(timestep.observation.step_count, self.num_agents),
+            step_count=jnp.broadcast_to(timestep.observation.step_count, (self.num_agents,)),
         )
         if self._use_individual_rewards:
             # The environment returns a list of individual rewards and these are used as is.
@@ -208,17 +202,15 @@ class ConnectorWrapper(JumanjiMarlWrapper):
 
         # TARGET = 3 = The number of different types of items on the grid.
         def create_agents_view(grid: chex.Array) -> chex.Array:
+            item_type = grid % TARGET
+            agent_index = jnp.ceil(grid / TARGET) / self.num_agents
+
             # Mark position and target of each agent with that agent's normalized index.
-            positions = (
-                jnp.where(grid % TARGET == POSITION, jnp.ceil(grid / TARGET), 0) / self.num_agents
-            )
-            targets = (
-                jnp.where((grid % TARGET == 0) & (grid != EMPTY), jnp.ceil(grid / TARGET), 0)
-                / self.num_agents
-            )
-            paths = jnp.where(grid % TARGET == PATH, 1, 0)
-            position_per_agent = jnp.where(grid == POSITION, 1, 0)
-            target_per_agent = jnp.where(grid == TARGET, 1, 0)
+            positions = jnp.where(item_type == POSITION, agent_index, 0)
+            targets = jnp.where((item_type == 0) & (grid != EMPTY), agent_index, 0)
+            paths = item_type == PATH
+            position_per_agent = grid == POSITION
+            target_per_agent = grid == TARGET
             agents_view = jnp.stack(
                 (positions, targets, paths, position_per_agent, target_per_agent), -1
             )
@@ -229,7 +221,7 @@ class ConnectorWrapper(JumanjiMarlWrapper):
         ) -> TimeStep[Observation]:
             """Aggregate individual rewards and discounts across agents."""
             team_reward = jnp.sum(timestep.reward)
-            reward = jnp.repeat(team_reward, self.num_agents)
+            reward = jnp.broadcast_to(team_reward, (self.num_agents,))
             return timestep.replace(reward=reward)
 
         timestep = aggregate_rewards(timestep)
@@ -237,7 +229,7 @@ class ConnectorWrapper(JumanjiMarlWrapper):
         obs_data = {
             "agents_view": create_agents_view(timestep.observation.grid),
             "action_mask": timestep.observation.action_mask,
-            "step_count": jnp.repeat(timestep.observation.step_count, self.num_agents),
+            "step_count": jnp.broadcast_to(timestep.observation.step_count, (self.num_agents,)),
         }
 
         # The episode is won if all agents have connected.
@@ -249,19 +241,14 @@ class ConnectorWrapper(JumanjiMarlWrapper):
         """Constructs the global state from the global information
         in the agent observations (positions, targets and paths.)
         """
-        return jnp.tile(obs.agents_view[..., :3][0], (obs.agents_view.shape[0], 1, 1, 1))
+        global_state = obs.agents_view[0, ..., :3]
+        return jnp.broadcast_to(global_state, (obs.agents_view.shape[0], *global_state.shape))
 
     def observation_spec(
         self,
     ) -> specs.Spec[Union[Observation, ObservationGlobalState]]:
         """Specification of the observation of the environment."""
-        step_count = specs.BoundedArray(
-            (self.num_agents,),
-            int,
-            jnp.zeros(self.num_agents, dtype=int),
-            jnp.repeat(self.time_limit, self.num_agents),
-            "step_count",
-        )
+        step_count = specs.BoundedArray((self.num_agents,), int, 0, self.time_limit, "step_count")
         agents_view = specs.BoundedArray(
             shape=(self._env.num_agents, self._env.grid_size, self._env.grid_size, 5),
             dtype=float,
@@ -313,8 +300,8 @@ class CleanerWrapper(JumanjiMarlWrapper):
 
             # Get dirty / wall tiles from first agent's obs and tile in agents dimension.
 
-            dirty_channel = jnp.tile(grid == DIRTY, (num_agents, 1, 1))  # (A, R, C)
-            wall_channel = jnp.tile(grid == WALL, (num_agents, 1, 1))  # (A, R, C)
+            dirty_channel = jnp.broadcast_to(grid == DIRTY, (num_agents, *grid.shape))  # (A, R, C)
+            wall_channel = jnp.broadcast_to(grid == WALL, (num_agents, *grid.shape))  # (A, R, C)
 
             # Get each agent's position.
             xs, ys = agents_locations[:, 0], agents_locations[:, 1]  # (A,), (A,)
@@ -322,10 +309,10 @@ class CleanerWrapper(JumanjiMarlWrapper):
             # Mask each agent's position so an agent can idenfity itself.
             # Sum the masked grids together for global agent information.
             # (A, R, C)
-            pos_per_agent = jnp.repeat(jnp.zeros_like(grid)[jnp.newaxis, :, :], num_agents, axis=0)
+            pos_per_agent = jnp.zeros((num_agents, *grid.shape), dtype=grid.dtype)
             pos_per_agent = pos_per_agent.at[jnp.arange(num_agents), xs, ys].set(1)  # (A, R, C)
             # (A, R, C)
-            agents_channel = jnp.tile(jnp.sum(pos_per_agent, axis=0), (num_agents, 1, 1))
+            agents_channel = jnp.broadcast_to(jnp.sum(pos_per_agent, axis=0), pos_per_agent.shape)
 
             # Stack the channels along the last dimension.
             agents_view = jnp.stack(
@@ -339,11 +326,11 @@ class CleanerWrapper(JumanjiMarlWrapper):
                 timestep.observation.grid, timestep.observation.agents_locations
             ),
             "action_mask": timestep.observation.action_mask,
-            "step_count": jnp.repeat(timestep.observation.step_count, self.num_agents),
+            "step_count": jnp.broadcast_to(timestep.observation.step_count, (self.num_agents,)),
         }
 
-        reward = jnp.repeat(timestep.reward, self.num_agents)
-        discount = jnp.repeat(timestep.discount, self.num_agents)
+        reward = jnp.broadcast_to(timestep.reward, (self.num_agents,))
+        discount = jnp.broadcast_to(timestep.discount, (self.num_agents,))
 
         # The episode is won if every tile is cleaned.
         extras = {"won_episode": timestep.extras["num_dirty_tiles"] == 0}
@@ -360,13 +347,7 @@ class CleanerWrapper(JumanjiMarlWrapper):
 
     def observation_spec(self) -> specs.Spec[Union[Observation, ObservationGlobalState]]:
         """Specification of the observation of the environment."""
-        step_count = specs.BoundedArray(
-            (self.num_agents,),
-            int,
-            jnp.zeros(self.num_agents, dtype=int),
-            jnp.repeat(self.time_limit, self.num_agents),
-            "step_count",
-        )
+        step_count = specs.BoundedArray((self.num_agents,), int, 0, self.time_limit, "step_count")
         agents_view = specs.BoundedArray(
             shape=(self.num_agents, self._env.num_rows, self._env.num_cols, 4),
             dtype=bool,
@@ -45,11 +45,11 @@ class MatraxWrapper(Wrapper):
         obs_data = {
             "agents_view": timestep.observation.agent_obs,
             "action_mask": self.action_mask,
-            "step_count": jnp.repeat(timestep.observation.step_count, self.num_agents),
+            "step_count": jnp.broadcast_to(timestep.observation.step_count, (self.num_agents,)),
         }
         if self.add_global_state:
             global_state = jnp.concatenate(timestep.observation.agent_obs, axis=0)
-            global_state = jnp.tile(global_state, (self.num_agents, 1))
+            global_state = jnp.broadcast_to(global_state, (self.num_agents, *global_state.shape))
             obs_data["global_state"] = global_state
             return timestep.replace(observation=ObservationGlobalState(**obs_data))
 
@@ -67,13 +67,7 @@ class MatraxWrapper(Wrapper):
 
     def observation_spec(self) -> specs.Spec[Union[Observation][ObservationGlobalState]]:
         """Specification of the observation of the environment."""
-        step_count = specs.BoundedArray(
-            (self.num_agents,),
-            int,
-            jnp.zeros(self.num_agents, dtype=int),
-            jnp.repeat(self.time_limit, self.num_agents),
-            "step_count",
-        )
+        step_count = specs.BoundedArray((self.num_agents,), int, 0, self.time_limit, "step_count")
         action_mask = specs.Array(
             (self.num_agents, self.num_actions),
             bool,